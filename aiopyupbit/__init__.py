@@ -1,6 +1,15 @@
 # !/usr/bin/python
 # -*- coding: utf-8 -*-
+from .arbitrage import *
 from .errors import *
 from .exchange_api import *
+from .indicators import *
+from .offload import *
+from .order_history import *
+from .orderbook import *
 from .quotation_api import *
 from .request_api import *
+from .simulator import *
+from .sync_api import *
+from .time_utils import *
+from .websocket_api import *
@@ -0,0 +1,178 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import numpy as np
+if __name__ == "__main__":
+    from exchange_api import DEFAULT_FEES
+    from quotation_api import get_current_price
+else:
+    from .exchange_api import DEFAULT_FEES
+    from .quotation_api import get_current_price
+
+# (price thresholds, tick sizes) of each quote currency. KRW follows get_tick_size
+TICK_TABLES = {
+    "KRW": (np.array([0, 10, 100, 1000, 10000, 100000, 500000, 1000000, 2000000], dtype=float),
+            np.array([0.01, 0.1, 1, 5, 10, 50, 100, 500, 1000], dtype=float)),
+    "BTC": (np.array([0], dtype=float),
+            np.array([0.00000001], dtype=float)),
+    "USDT": (np.array([0, 0.0001, 0.001, 0.01, 0.1, 1, 10], dtype=float),
+             np.array([0.00000001, 0.0000001, 0.000001, 0.00001, 0.0001, 0.001, 0.01], dtype=float)),
+}
+
+
+def tick_sizes(prices: np.ndarray, quote: str = "KRW", direction: str = "up") -> np.ndarray:
+    """Vectorized order price unit lookup
+
+    Args:
+        prices (np.ndarray): Prices on the tick grid
+        quote (str, optional): Quote currency. Ticks are 0 if it has no tick table. Defaults to "KRW".
+        direction (str, optional): "up" for the tick to the next higher price, "down" for
+            the tick to the next lower price (they differ at band thresholds). Defaults to "up".
+
+    Returns:
+        np.ndarray: Tick sizes
+    """
+    if quote not in TICK_TABLES:
+        return np.zeros_like(prices)
+    thresholds, ticks = TICK_TABLES[quote]
+    side = "right" if direction == "up" else "left"
+    return ticks[np.clip(np.searchsorted(thresholds, prices, side=side) - 1, 0, None)]
+
+
+def round_ticks(prices: np.ndarray, quote: str = "KRW", method: str = "floor") -> np.ndarray:
+    """Vectorized order price unit adjustment
+
+    Args:
+        prices (np.ndarray): Prices
+        quote (str, optional): Quote currency. Prices are returned as is if it has no tick table. Defaults to "KRW".
+        method (str, optional): Order price calculate method ("floor", "ceil"). Defaults to "floor".
+
+    Returns:
+        np.ndarray: Prices adjusted in units of order price
+    """
+    if quote not in TICK_TABLES:
+        return prices
+    tick = tick_sizes(prices, quote)
+    # Tolerance for float error, e.g. 0.3 / 0.1 == 2.9999999999999996
+    if method == "floor":
+        return np.floor(prices / tick + 1e-9) * tick
+    return np.ceil(prices / tick - 1e-9) * tick
+
+
+class TriangularScanner:
+    """Triangular arbitrage scanner over quote markets
+
+    Every cycle base -> bridge -> alt -> base (and its reverse) is found once
+    from the ticker list, e.g. KRW -> BTC -> ETH -> KRW through KRW-BTC, BTC-ETH
+    and KRW-ETH. The latest prices are kept in one array, and the implied return
+    of every cycle is evaluated in one vectorized pass. Prices are rounded to the
+    tick grid (buys up, sells down, for prices such as mid prices that are off
+    the grid), then each leg crosses one more tick (buys one tick above, sells
+    one tick below) as an estimate of the spread, and pays the fee of its quote
+    currency.
+
+        scanner = TriangularScanner(await get_tickers())
+        await scanner.refresh()
+        print(scanner.scan(top=5))
+    """
+
+    def __init__(self, tickers: list, base: str = "KRW", fees: dict = None):
+        """
+        Args:
+            tickers (list): Market codes (`get_tickers` result)
+            base (str, optional): Start and end currency. Defaults to "KRW".
+            fees (dict, optional): Fee rate for each quote currency. Defaults to DEFAULT_FEES.
+        """
+        fees = dict(DEFAULT_FEES, **(fees or {}))
+        available = set(tickers)
+        quotes = sorted({x.split("-")[0] for x in available} - {base})
+        cycles = []
+        for bridge in quotes:
+            if f"{base}-{bridge}" not in available:
+                continue
+            for market in sorted(available):
+                quote, alt = market.split("-")
+                if quote == bridge and f"{base}-{alt}" in available:
+                    cycles.append((bridge, alt))
+
+        self.base = base
+        self.markets = sorted({m for bridge, alt in cycles
+                               for m in (f"{base}-{bridge}", f"{bridge}-{alt}", f"{base}-{alt}")})
+        self.index = {market: i for i, market in enumerate(self.markets)}
+        self.prices = np.full(len(self.markets), np.nan)
+        self.quotes = {}
+        for i, market in enumerate(self.markets):
+            self.quotes.setdefault(market.split("-")[0], []).append(i)
+        self.quotes = {quote: np.array(idx) for quote, idx in self.quotes.items()}
+
+        self.paths = ([(base, bridge, alt, base) for bridge, alt in cycles]
+                      + [(base, alt, bridge, base) for bridge, alt in cycles])
+        self._base_bridge = np.array([self.index[f"{base}-{bridge}"] for bridge, alt in cycles], dtype=np.int64)
+        self._bridge_alt = np.array([self.index[f"{bridge}-{alt}"] for bridge, alt in cycles], dtype=np.int64)
+        self._base_alt = np.array([self.index[f"{base}-{alt}"] for bridge, alt in cycles], dtype=np.int64)
+        self._fee = np.array([(1 - fees.get(base, 0)) ** 2 * (1 - fees.get(bridge, 0)) for bridge, alt in cycles])
+
+    def update(self, prices: dict):
+        """Update the latest prices
+
+        Args:
+            prices (dict): {market: price} (`get_current_price` result)
+        """
+        for market, price in prices.items():
+            i = self.index.get(market)
+            if i is not None:
+                self.prices[i] = price
+
+    def returns(self) -> np.ndarray:
+        """Implied return of every cycle
+
+        Returns:
+            np.ndarray: Returns in the order of `paths` (forward cycles, then reverse cycles)
+        """
+        bid = np.empty_like(self.prices)
+        ask = np.empty_like(self.prices)
+        for quote, idx in self.quotes.items():
+            bid[idx] = round_ticks(self.prices[idx], quote, "floor")
+            bid[idx] -= tick_sizes(bid[idx], quote, "down")
+            ask[idx] = round_ticks(self.prices[idx], quote, "ceil")
+            ask[idx] += tick_sizes(ask[idx], quote, "up")
+        forward = bid[self._base_alt] / (ask[self._base_bridge] * ask[self._bridge_alt])
+        reverse = bid[self._bridge_alt] * bid[self._base_bridge] / ask[self._base_alt]
+        return np.concatenate((forward * self._fee, reverse * self._fee)) - 1
+
+    def scan(self, top: int = 10, min_return: float = None) -> list:
+        """Ranked cycles
+
+        Args:
+            top (int, optional): Number of cycles to return. Defaults to 10.
+            min_return (float, optional): Minimum implied return. Defaults to None.
+
+        Returns:
+            list: [(path, return), ...] in descending return
+        """
+        returns = np.nan_to_num(self.returns(), nan=-np.inf)
+        top = min(top, len(returns))
+        if top <= 0:
+            return []
+        idx = np.argpartition(-returns, top - 1)[:top]
+        idx = idx[np.argsort(-returns[idx])]
+        ranked = [(self.paths[i], float(returns[i])) for i in idx if returns[i] > -np.inf]
+        if min_return is not None:
+            ranked = [x for x in ranked if x[1] >= min_return]
+        return ranked
+
+    async def refresh(self, contain_req: bool = False) -> dict or tuple:
+        """Fetch the latest prices of every market in the scanner
+
+        Args:
+            contain_req (bool, optional): Contain send request limitation information to return. Defaults to False.
+
+        Returns:
+            dict or tuple: tuple if contain_req else {market: price}
+        """
+        if not self.markets:
+            return ({}, None) if contain_req else {}
+        prices, remain = await get_current_price(self.markets, contain_req=True)
+        if not isinstance(prices, dict):
+            prices = {self.markets[0]: prices}
+        self.update(prices)
+        return (prices, remain) if contain_req else prices
@@ -93,6 +93,11 @@ class InValidAccessKey(UpbitError):
         return "잘못된 엑세스 키입니다."
 
 
+class OrderNotFound(UpbitError):
+    def __str__(self):
+        return "주문을 찾지 못했습니다."
+
+
 async def raise_error(response):
     response_json = await response.json()
     code = response.status
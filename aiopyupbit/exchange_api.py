@@ -7,10 +7,16 @@ import hashlib
 import jwt
 from urllib.parse import urlencode
 if __name__ == "__main__":
+    from offload import run_cpu
     from request_api import _send_get_request, _send_post_request, _send_delete_request
 else:
+    from .offload import run_cpu
     from .request_api import _send_get_request, _send_post_request, _send_delete_request
 
+# Trading fee rate and minimum order total of each quote currency
+DEFAULT_FEES = {"KRW": 0.0005, "BTC": 0.0025, "USDT": 0.0025}
+MIN_ORDER_TOTALS = {"KRW": 5000, "BTC": 0.0005, "USDT": 0.5}
+
 
 def get_tick_size(price: float or int,
                   method="floor") -> float:
@@ -50,34 +56,49 @@ def get_tick_size(price: float or int,
         return func(price / 0.01) / 100
 
 
+def _make_headers(access: str, secret: str, query: dict or list = None) -> dict:
+    """Build authorization request header
+
+    Args:
+        access (str): Access key
+        secret (str): Secret key
+        query (dict or list, optional): Header query. Defaults to None.
+
+    Returns:
+        dict: Included authorization request header
+    """
+    payload = {"access_key": access,
+               "nonce": str(uuid.uuid4())}
+    if query:
+        m = hashlib.sha512()
+        m.update(urlencode(query, doseq=True).replace(
+            "%5B%5D=", "[]=").encode())
+        query_hash = m.hexdigest()
+        payload['query_hash'] = query_hash
+        payload['query_hash_alg'] = "SHA512"
+
+    jwt_token = jwt.encode(payload=payload,
+                           key=secret,
+                           algorithm="HS256")
+    return {"Authorization": f'Bearer {jwt_token}'}
+
+
 class Upbit:
     def __init__(self, access: str, secret: str):
         self.access = access
         self.secret = secret
 
-    async def _request_headers(self, query: dict = None) -> dict:
+    async def _request_headers(self, query: dict or list = None) -> dict:
         """Get request header
 
         Args:
-            query (dict, optional): Header query. Defaults to None.
+            query (dict or list, optional): Header query. Defaults to None.
 
         Returns:
             dict: Included authorization request header
         """
-        payload = {"access_key": self.access,
-                   "nonce": str(uuid.uuid4())}
-        if query:
-            m = hashlib.sha512()
-            m.update(urlencode(query, doseq=True).replace(
-                "%5B%5D=", "[]=").encode())
-            query_hash = m.hexdigest()
-            payload['query_hash'] = query_hash
-            payload['query_hash_alg'] = "SHA512"
-
-        jwt_token = jwt.encode(payload=payload,
-                               key=self.secret,
-                               algorithm="HS256")
-        return {"Authorization": f'Bearer {jwt_token}'}
+        size = len(urlencode(query, doseq=True)) if query else 0
+        return await run_cpu(_make_headers, self.access, self.secret, query, size=size)
 
     async def check_authentication(self) -> tuple or bool:
         """Check account's access/secret key authentication
@@ -202,30 +223,47 @@ class Upbit:
                         ticker_or_uuid: str,
                         state: str = 'wait',
                         kind: str = 'normal',
-                        contain_req: bool = False) -> tuple or list:
+                        contain_req: bool = False,
+                        states: list = None,
+                        identifiers: list = None,
+                        page: int = 1,
+                        limit: int = 100,
+                        order_by: str = 'desc') -> tuple or list:
         """Get order information list
 
         Args:
-            ticker_or_uuid (str): Coin's ticker or UUID
-            state (str, optional): Order status (wait, done, cancel). Defaults to 'wait'.
-            kind (str, optional): Order type (normal, watch). Defaults to 'normal'.
+            ticker_or_uuid (str): Coin's ticker or UUID, None for all markets
+            state (str, optional): Order status (wait, watch, done, cancel). Defaults to 'wait'.
+            kind (str, optional): Order type (normal, watch, all). Defaults to 'normal'.
             contain_req (bool, optional): Contain send request limitation information to return. Defaults to False.
+            states (list, optional): Order status list, used instead of state. Defaults to None.
+            identifiers (list, optional): Order identifier list. Defaults to None.
+            page (int, optional): Page number. Defaults to 1.
+            limit (int, optional): Orders per page (max 100). Defaults to 100.
+            order_by (str, optional): Sort order (asc, desc). Defaults to 'desc'.
 
         Returns:
             tuple or list: tuple if contain_req else list
         """
         url = "https://api.upbit.com/v1/orders"
-        # TODO : states, identifiers 관련 기능 추가 필요
         p = re.compile(r"^\w+-\w+-\w+-\w+-\w+$")
         # 정확히는 입력을 대문자로 변환 후 다음 정규식을 적용해야 함
         # - r"^[0-9A-F]{8}-[0-9A-F]{4}-4[0-9A-F]{3}-[89AB][0-9A-F]{3}-[0-9A-F]{12}$"
-        if len(p.findall(ticker_or_uuid)) > 0:
+        if ticker_or_uuid and len(p.findall(ticker_or_uuid)) > 0:
             data = {'uuid': ticker_or_uuid}
         else:
-            data = {'market': ticker_or_uuid,
-                    'state': state,
-                    'kind': kind,
-                    'order_by': 'desc'}
+            # 배열 파라미터(states[], identifiers[])를 위해 (key, value) 리스트로 전달
+            data = [('market', ticker_or_uuid)] if ticker_or_uuid else []
+            data += [('kind', kind),
+                     ('page', page),
+                     ('limit', limit),
+                     ('order_by', order_by)]
+            if states:
+                data += [('states[]', x) for x in states]
+            else:
+                data.append(('state', state))
+            if identifiers:
+                data += [('identifiers[]', x) for x in identifiers]
         headers = await self._request_headers(data)
         body, remain = await _send_get_request(url, headers=headers, data=data)
         return (body, remain) if contain_req else body
@@ -0,0 +1,239 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import numpy as np
+from pandas.core.frame import DataFrame
+
+
+class Indicator:
+    """Base class of incremental indicators
+
+    State is kept in arrays with one row per market. Every indicator keeps the
+    state before the latest candle (`base`) and after it (`cur`), so the latest
+    candle can be revised while it is still forming:
+
+    * `_reset(idx)` clears the state
+    * `_commit(idx)` closes the latest candle (cur -> base)
+    * `_apply(idx, high, low, close)` recomputes cur from base and the candle
+
+    `idx` is a market index or `slice(None)` for all markets.
+    """
+    _state = ()
+
+    def _allocate(self, n: int):
+        for name in self._state:
+            setattr(self, "_base_" + name, np.full(n, np.nan))
+            setattr(self, "_cur_" + name, np.full(n, np.nan))
+
+    def _reset(self, idx):
+        for name in self._state:
+            getattr(self, "_base_" + name)[idx] = np.nan
+            getattr(self, "_cur_" + name)[idx] = np.nan
+
+    def _commit(self, idx):
+        for name in self._state:
+            getattr(self, "_base_" + name)[idx] = getattr(self, "_cur_" + name)[idx]
+
+    def _apply(self, idx, high, low, close):
+        raise NotImplementedError
+
+    def value(self, idx=slice(None)):
+        raise NotImplementedError
+
+
+class EMA(Indicator):
+    """Exponential moving average of close"""
+    _state = ("ema",)
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+
+    def _apply(self, idx, high, low, close):
+        base = self._base_ema[idx]
+        self._cur_ema[idx] = np.where(np.isnan(base), close, base + self.alpha * (close - base))
+
+    def value(self, idx=slice(None)):
+        return self._cur_ema[idx]
+
+
+class RSI(Indicator):
+    """Relative strength index with Wilder's smoothing"""
+    _state = ("close", "gain", "loss")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.alpha = 1 / period
+
+    def _apply(self, idx, high, low, close):
+        prev, gain, loss = self._base_close[idx], self._base_gain[idx], self._base_loss[idx]
+        diff = close - prev
+        up, down = np.maximum(diff, 0), np.maximum(-diff, 0)
+        seeded = np.isnan(gain)
+        self._cur_gain[idx] = np.where(seeded, up, gain + self.alpha * (up - gain))
+        self._cur_loss[idx] = np.where(seeded, down, loss + self.alpha * (down - loss))
+        self._cur_close[idx] = close
+
+    def value(self, idx=slice(None)):
+        gain, loss = self._cur_gain[idx], self._cur_loss[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + gain / loss)
+        return np.where(loss == 0, 100.0, rsi)
+
+
+class ATR(Indicator):
+    """Average true range with Wilder's smoothing"""
+    _state = ("close", "atr")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+
+    def _apply(self, idx, high, low, close):
+        prev, atr = self._base_close[idx], self._base_atr[idx]
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+        self._cur_atr[idx] = np.where(np.isnan(atr), tr, atr + (tr - atr) / self.period)
+        self._cur_close[idx] = close
+
+    def value(self, idx=slice(None)):
+        return self._cur_atr[idx]
+
+
+class BollingerBands(Indicator):
+    """Bollinger bands of close
+
+    The window is kept in a ring buffer with running sums. Values are NaN until
+    `period` candles have been seen.
+    """
+    _state = ("sum", "sq", "n")
+
+    def __init__(self, period: int = 20, k: float = 2):
+        self.period = period
+        self.k = k
+
+    def _allocate(self, n: int):
+        super()._allocate(n)
+        self._ring = np.zeros((n, self.period))
+        self._slot = np.full(n, -1, dtype=np.int64)
+        self._rows = np.arange(n)
+        self._reset(slice(None))
+
+    def _reset(self, idx):
+        super()._reset(idx)
+        for name in self._state:
+            getattr(self, "_cur_" + name)[idx] = 0
+        self._ring[idx] = 0
+        self._slot[idx] = -1
+
+    def _commit(self, idx):
+        rows = self._rows[idx]
+        full = self._cur_n[idx] >= self.period
+        self._slot[idx] = (self._slot[idx] + 1) % self.period
+        evicted = np.where(full, self._ring[rows, self._slot[idx]], 0)
+        self._base_sum[idx] = self._cur_sum[idx] - evicted
+        self._base_sq[idx] = self._cur_sq[idx] - evicted * evicted
+        self._base_n[idx] = np.where(full, self.period - 1, self._cur_n[idx])
+
+    def _apply(self, idx, high, low, close):
+        self._ring[self._rows[idx], self._slot[idx]] = close
+        self._cur_sum[idx] = self._base_sum[idx] + close
+        self._cur_sq[idx] = self._base_sq[idx] + close * close
+        self._cur_n[idx] = self._base_n[idx] + 1
+
+    def value(self, idx=slice(None)):
+        """
+        Returns:
+            tuple: (middle, upper, lower)
+        """
+        n = self._cur_n[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mid = np.where(n >= self.period, self._cur_sum[idx] / n, np.nan)
+            std = np.sqrt(np.maximum(self._cur_sq[idx] / n - mid * mid, 0))
+        return mid, mid + self.k * std, mid - self.k * std
+
+
+class IndicatorEngine:
+    """Incremental indicators for many markets
+
+    Seed each market from a `get_ohlcv` frame, then feed one candle at a time.
+    Every update is O(1) per indicator and market; `update_all` updates every
+    market in one vectorized step.
+
+        engine = IndicatorEngine(["KRW-BTC", "KRW-ETH"],
+                                 {"ema20": EMA(20), "rsi": RSI(14), "atr": ATR(14), "bb": BollingerBands(20, 2)})
+        engine.seed("KRW-BTC", await get_ohlcv("KRW-BTC", interval="minute1"))
+        engine.update("KRW-BTC", high, low, close, new_candle=False)
+    """
+
+    def __init__(self, markets: list, indicators: dict):
+        """
+        Args:
+            markets (list): Market codes
+            indicators (dict): {name: Indicator}
+        """
+        self.markets = list(markets)
+        self.index = {market: i for i, market in enumerate(self.markets)}
+        self.indicators = indicators
+        for indicator in self.indicators.values():
+            indicator._allocate(len(self.markets))
+
+    def seed(self, market: str, df: DataFrame):
+        """Seed a market from candle data, discarding its previous state
+
+        Args:
+            market (str): Market code
+            df (DataFrame): Candle data in ascending time order (`get_ohlcv` format)
+        """
+        idx = self.index[market]
+        for indicator in self.indicators.values():
+            indicator._reset(idx)
+        for high, low, close in zip(df["high"].tolist(), df["low"].tolist(), df["close"].tolist()):
+            self.update(market, high, low, close)
+
+    def update(self, market: str, high: float, low: float, close: float, new_candle: bool = True):
+        """Update a market with one candle
+
+        Args:
+            market (str): Market code
+            high (float): High price
+            low (float): Low price
+            close (float): Close price
+            new_candle (bool, optional): False to revise the latest candle instead of adding one. Defaults to True.
+        """
+        self._step(self.index[market], high, low, close, new_candle)
+
+    def update_all(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, new_candle: bool = True):
+        """Update every market with one candle each
+
+        Args:
+            high (np.ndarray): High prices in the order of `markets`
+            low (np.ndarray): Low prices in the order of `markets`
+            close (np.ndarray): Close prices in the order of `markets`
+            new_candle (bool, optional): False to revise the latest candles instead of adding them. Defaults to True.
+        """
+        self._step(slice(None),
+                   np.asarray(high, dtype=float),
+                   np.asarray(low, dtype=float),
+                   np.asarray(close, dtype=float),
+                   new_candle)
+
+    def _step(self, idx, high, low, close, new_candle):
+        for indicator in self.indicators.values():
+            if new_candle:
+                indicator._commit(idx)
+            indicator._apply(idx, high, low, close)
+
+    def value(self, name: str, market: str = None):
+        """Latest indicator value
+
+        Args:
+            name (str): Indicator name
+            market (str, optional): Market code. Defaults to None (all markets).
+
+        Returns:
+            float or np.ndarray or tuple: Value of the market, or array in the order of `markets`
+        """
+        if market is None:
+            return self.indicators[name].value(slice(None))
+        value = self.indicators[name].value(self.index[market])
+        if isinstance(value, tuple):
+            return tuple(x.item() for x in value)
+        return value.item()
@@ -0,0 +1,149 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Work size is measured in bytes of the JSON payload being processed.
+# One candle row of the candle API is about this many bytes
+CANDLE_ROW_BYTES = 300
+
+_offload = {"mode": None, "threshold": 16384, "max_workers": None}
+_executor = None
+
+
+def set_offload_mode(mode: str = None,
+                     threshold: int = 16384,
+                     max_workers: int = None):
+    """Configure where CPU-heavy post-processing runs
+
+    Args:
+        mode (str, optional): None (inline on the event loop), "thread" or "process". Defaults to None.
+        threshold (int, optional): Minimum work size in payload bytes to offload. A 200 candle
+            response is about 60000 bytes, a signed query about 100 bytes; 0 offloads every call. Defaults to 16384.
+        max_workers (int, optional): Executor worker count. Defaults to None (executor default).
+    """
+    global _executor
+    if mode not in (None, "thread", "process"):
+        raise ValueError(f"Unknown offload mode: {mode}")
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    _offload.update(mode=mode, threshold=threshold, max_workers=max_workers)
+
+
+def get_offload_mode() -> dict:
+    """Current offload configuration
+
+    Returns:
+        dict: {'mode': None, 'threshold': 16384, 'max_workers': None}
+    """
+    return dict(_offload)
+
+
+def shutdown_offload(wait: bool = True):
+    """Shut down the offload executor
+
+    Args:
+        wait (bool, optional): Wait for running tasks. Defaults to True.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        if _offload["mode"] == "process":
+            _executor = ProcessPoolExecutor(max_workers=_offload["max_workers"])
+        else:
+            _executor = ThreadPoolExecutor(max_workers=_offload["max_workers"],
+                                           thread_name_prefix="aiopyupbit")
+    return _executor
+
+
+async def run_cpu(func, *args, size: int = 0, **kwargs):
+    """Run synchronous CPU work, offloading it to the executor when it is large enough
+
+    Args:
+        func (function): Synchronous function. Must be picklable in "process" mode
+        size (int, optional): Work size in payload bytes, compared with the offload threshold. Defaults to 0.
+
+    Returns:
+        Any: Return value of func
+    """
+    if _offload["mode"] is None or size < _offload["threshold"]:
+        return func(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+class LoopLagProbe:
+    """Measure event loop responsiveness
+
+    A background task sleeps for `interval` seconds repeatedly and records how late
+    it wakes up. Use it as an async context manager around the workload:
+
+        async with LoopLagProbe() as probe:
+            await workload()
+        print(probe.stats())
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Args:
+            interval (float, optional): Sampling interval in seconds. Defaults to 0.01.
+        """
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        """Start sampling"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> dict:
+        """Stop sampling
+
+        Returns:
+            dict: Lag statistics (see `stats`)
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.stats()
+
+    def stats(self) -> dict:
+        """Lag statistics in seconds
+
+        Returns:
+            dict: {'samples': 100, 'mean': 0.0002, 'p99': 0.001, 'max': 0.003}
+        """
+        if not self.samples:
+            return {"samples": 0, "mean": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(self.samples)
+        return {"samples": len(ordered),
+                "mean": sum(ordered) / len(ordered),
+                "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+                "max": ordered[-1]}
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
@@ -0,0 +1,203 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import time
+import pandas as pd
+
+ORDER_COLUMNS = ['uuid',
+                 'side',
+                 'ord_type',
+                 'price',
+                 'state',
+                 'market',
+                 'created_at',
+                 'volume',
+                 'remaining_volume',
+                 'reserved_fee',
+                 'remaining_fee',
+                 'paid_fee',
+                 'locked',
+                 'executed_volume',
+                 'trades_count']
+
+
+def _check_limit(limit: int):
+    # A short page ends the iteration, so a limit the API cannot serve would truncate it
+    if not 1 <= limit <= 100:
+        raise ValueError(f"limit must be between 1 and 100: {limit}")
+
+
+async def iter_orders(upbit,
+                      markets: str or list,
+                      states: list = ('done', 'cancel'),
+                      limit: int = 100,
+                      concurrency: int = 3,
+                      start: dict = None,
+                      kind: str = 'normal'):
+    """Page through order history
+
+    Pages are requested in ascending creation order so that orders created
+    during the export do not shift the pages already read. Up to `concurrency`
+    page requests are in flight at once, and new requests are held back while
+    the remaining per-second request budget is lower than that.
+
+    Args:
+        upbit (Upbit): Authenticated Upbit instance
+        markets (str or list): Coin's ticker or ticker list
+        states (list, optional): Order status list. Defaults to ('done', 'cancel').
+        limit (int, optional): Orders per page (max 100). Defaults to 100.
+        concurrency (int, optional): Page requests in flight. Defaults to 3.
+        start (dict, optional): First page of each market ({'KRW-BTC': 3}). Defaults to None (1).
+        kind (str, optional): Order type (normal, watch, all). Defaults to 'normal'.
+
+    Yields:
+        tuple: (market, page, orders) in page order
+    """
+    _check_limit(limit)
+    if isinstance(markets, str):
+        markets = [markets]
+    start = start or {}
+    budget = {'sec': concurrency, 'at': 0.0}
+
+    async def fetch(market, page):
+        # Wait for the next second window when the request budget runs low
+        while budget['sec'] < concurrency and time.monotonic() - budget['at'] < 1:
+            await asyncio.sleep(1 - (time.monotonic() - budget['at']))
+        body, remain = await upbit.get_order(market,
+                                             kind=kind,
+                                             states=list(states),
+                                             page=page,
+                                             limit=limit,
+                                             order_by='asc',
+                                             contain_req=True)
+        budget.update(sec=remain['sec'], at=time.monotonic())
+        return body
+
+    for market in markets:
+        page = start.get(market, 1)
+        pending = [asyncio.ensure_future(fetch(market, page + i)) for i in range(concurrency)]
+        next_page = page + concurrency
+        try:
+            while pending:
+                orders = await pending.pop(0)
+                yield market, page, orders
+                if len(orders) < limit:
+                    break
+                page += 1
+                pending.append(asyncio.ensure_future(fetch(market, next_page)))
+                next_page += 1
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _load_checkpoint(path: str) -> dict:
+    if not os.path.exists(path):
+        return {'markets': {}, 'chunks': 0, 'offset': 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: str, checkpoint: dict):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def _discard_unrecorded(path: str, fmt: str, checkpoint: dict):
+    # Remove output written after the last saved checkpoint (or all of it for a fresh export)
+    if fmt == 'parquet':
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                if name.startswith('part-') and int(name[5:10]) >= checkpoint['chunks']:
+                    os.remove(os.path.join(path, name))
+    elif os.path.exists(path):
+        with open(path, 'r+b') as f:
+            f.truncate(checkpoint.get('offset', 0))
+
+
+def _write_chunk(path: str, fmt: str, rows: list, checkpoint: dict):
+    df = pd.DataFrame(rows).reindex(columns=ORDER_COLUMNS)
+    if fmt == 'parquet':
+        os.makedirs(path, exist_ok=True)
+        df.to_parquet(os.path.join(path, f'part-{checkpoint["chunks"]:05d}.parquet'), index=False)
+    else:
+        header = not os.path.exists(path) or os.path.getsize(path) == 0
+        df.to_csv(path, mode='a', header=header, index=False)
+        checkpoint['offset'] = os.path.getsize(path)
+    checkpoint['chunks'] += 1
+
+
+async def export_orders(upbit,
+                        path: str,
+                        markets: str or list,
+                        states: list = ('done', 'cancel'),
+                        fmt: str = None,
+                        chunk_size: int = 1000,
+                        limit: int = 100,
+                        concurrency: int = 3,
+                        resume: bool = True) -> int:
+    """Export order history to CSV or Parquet in bounded-size chunks
+
+    Every chunk holds exactly `chunk_size` orders except the last one.
+    CSV chunks are appended to one file. Parquet chunks are written as
+    `part-00000.parquet`, ... files in the `path` directory (requires pyarrow).
+    Progress (pages, chunk count and CSV size) is saved to `<path>.checkpoint.json`
+    after every chunk. Output written after the last checkpoint is discarded on
+    resume, so an interrupted export resumes from the last exported page without
+    duplicates. Without resume the existing output is replaced.
+
+    Args:
+        upbit (Upbit): Authenticated Upbit instance
+        path (str): Output file (CSV) or directory (Parquet)
+        markets (str or list): Coin's ticker or ticker list
+        states (list, optional): Order status list. Defaults to ('done', 'cancel').
+        fmt (str, optional): "csv" or "parquet". Defaults to None (inferred from path).
+        chunk_size (int, optional): Orders per written chunk. Defaults to 1000.
+        limit (int, optional): Orders per page (max 100). Defaults to 100.
+        concurrency (int, optional): Page requests in flight. Defaults to 3.
+        resume (bool, optional): Resume from the checkpoint. Defaults to True.
+
+    Returns:
+        int: Number of exported orders
+    """
+    _check_limit(limit)
+    if fmt is None:
+        fmt = 'parquet' if path.endswith('.parquet') else 'csv'
+    checkpoint_path = path.rstrip('/\\') + '.checkpoint.json'
+    checkpoint = _load_checkpoint(checkpoint_path) if resume else {'markets': {}, 'chunks': 0, 'offset': 0}
+    _discard_unrecorded(path, fmt, checkpoint)
+    done = checkpoint['markets']
+    # A page which was partially filled at the last export is read again, skipping the exported orders
+    start = {market: x['page'] if x['count'] < limit else x['page'] + 1 for market, x in done.items()}
+
+    # Buffered (market, page, orders exported from the page up to this one, order)
+    rows = []
+    progress = {}
+    exported = 0
+
+    def flush(final=False):
+        nonlocal rows, exported
+        while len(rows) >= chunk_size or (final and rows):
+            chunk, rows = rows[:chunk_size], rows[chunk_size:]
+            _write_chunk(path, fmt, [x[3] for x in chunk], checkpoint)
+            exported += len(chunk)
+            for market, page, count, _ in chunk:
+                done[market] = {'page': page, 'count': count}
+            _save_checkpoint(checkpoint_path, checkpoint)
+        if final:
+            done.update(progress)
+            _save_checkpoint(checkpoint_path, checkpoint)
+
+    async for market, page, orders in iter_orders(upbit, markets, states, limit, concurrency, start):
+        skip = done[market]['count'] if market in done and done[market]['page'] == page else 0
+        rows.extend((market, page, i + 1, x) for i, x in enumerate(orders[skip:], skip))
+        if orders or market not in progress:
+            progress[market] = {'page': page, 'count': len(orders)}
+        flush()
+    flush(final=True)
+    return exported
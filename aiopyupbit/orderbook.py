@@ -0,0 +1,172 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import numpy as np
+if __name__ == "__main__":
+    from quotation_api import get_orderbook
+else:
+    from .quotation_api import get_orderbook
+
+ASK_PRICE = 0
+ASK_SIZE = 1
+BID_PRICE = 2
+BID_SIZE = 3
+
+_UNIT_FIELDS = ("ask_price", "ask_size", "bid_price", "bid_size")
+
+
+class OrderbookMatrix:
+    """Orderbooks of several markets as one dense array
+
+    `data` has shape (markets, levels, 4) where the last axis is
+    [ASK_PRICE, ASK_SIZE, BID_PRICE, BID_SIZE]. Missing levels are padded with
+    NaN prices and zero sizes. Every analytic returns one value per market in
+    the order of `markets`.
+    """
+
+    def __init__(self, data: np.ndarray, markets: list, timestamps: np.ndarray = None):
+        """
+        Args:
+            data (np.ndarray): Orderbook array of shape (markets, levels, 4)
+            markets (list): Market codes
+            timestamps (np.ndarray, optional): Orderbook timestamps (ms). Defaults to None.
+        """
+        self.data = data
+        self.markets = list(markets)
+        self.index = {market: i for i, market in enumerate(self.markets)}
+        self.timestamps = timestamps
+
+    @classmethod
+    def from_orderbook(cls, body: list, levels: int = None) -> "OrderbookMatrix":
+        """Convert `get_orderbook` response
+
+        Args:
+            body (list): `get_orderbook` response
+            levels (int, optional): Number of levels to keep. Defaults to None (all).
+
+        Returns:
+            OrderbookMatrix: Orderbook matrix
+        """
+        depth = max((len(x["orderbook_units"]) for x in body), default=0)
+        if levels is not None:
+            depth = min(depth, levels)
+        data = np.zeros((len(body), depth, 4))
+        data[:, :, ASK_PRICE] = np.nan
+        data[:, :, BID_PRICE] = np.nan
+        for i, x in enumerate(body):
+            units = x["orderbook_units"][:depth]
+            if units:
+                data[i, :len(units)] = [[u[k] for k in _UNIT_FIELDS] for u in units]
+        timestamps = np.array([x.get("timestamp", 0) for x in body], dtype=np.int64)
+        return cls(data, [x["market"] for x in body], timestamps)
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def __getitem__(self, market: str) -> np.ndarray:
+        return self.data[self.index[market]]
+
+    def by_market(self, values: np.ndarray) -> dict:
+        """Label per-market values
+
+        Args:
+            values (np.ndarray): One value per market
+
+        Returns:
+            dict: {market: value}
+        """
+        return dict(zip(self.markets, values.tolist()))
+
+    def best(self) -> tuple:
+        """Best ask and bid
+
+        Returns:
+            tuple: (ask_price, ask_size, bid_price, bid_size) arrays
+        """
+        if self.data.shape[1] == 0:
+            nan = np.full(len(self.markets), np.nan)
+            return nan, nan, nan, nan
+        top = self.data[:, 0, :]
+        return top[:, ASK_PRICE], top[:, ASK_SIZE], top[:, BID_PRICE], top[:, BID_SIZE]
+
+    def spread(self, relative: bool = False) -> np.ndarray:
+        """Best ask - best bid
+
+        Args:
+            relative (bool, optional): Divide by mid price. Defaults to False.
+
+        Returns:
+            np.ndarray: Spread
+        """
+        ask, _, bid, _ = self.best()
+        spread = ask - bid
+        return spread / ((ask + bid) / 2) if relative else spread
+
+    def mid(self) -> np.ndarray:
+        """Mid price
+
+        Returns:
+            np.ndarray: (best ask + best bid) / 2
+        """
+        ask, _, bid, _ = self.best()
+        return (ask + bid) / 2
+
+    def microprice(self) -> np.ndarray:
+        """Top-of-book size weighted price
+
+        Returns:
+            np.ndarray: (ask * bid_size + bid * ask_size) / (ask_size + bid_size)
+        """
+        ask, ask_size, bid, bid_size = self.best()
+        return (ask * bid_size + bid * ask_size) / (ask_size + bid_size)
+
+    def depth(self, pct: float = 0.01, value: bool = False) -> tuple:
+        """Resting size within pct of the mid price
+
+        Args:
+            pct (float, optional): Distance from the mid price (0.01 == 1%). Defaults to 0.01.
+            value (bool, optional): Sum price * size instead of size. Defaults to False.
+
+        Returns:
+            tuple: (ask_depth, bid_depth) arrays
+        """
+        mid = self.mid()[:, None]
+        ask_price, bid_price = self.data[:, :, ASK_PRICE], self.data[:, :, BID_PRICE]
+        ask_size, bid_size = self.data[:, :, ASK_SIZE], self.data[:, :, BID_SIZE]
+        if value:
+            ask_size, bid_size = ask_price * ask_size, bid_price * bid_size
+        ask = np.where(ask_price <= mid * (1 + pct), ask_size, 0).sum(axis=1)
+        bid = np.where(bid_price >= mid * (1 - pct), bid_size, 0).sum(axis=1)
+        return ask, bid
+
+    def imbalance(self, levels: int = None) -> np.ndarray:
+        """Bid/ask size imbalance
+
+        Args:
+            levels (int, optional): Number of top levels to use. Defaults to None (all).
+
+        Returns:
+            np.ndarray: (bid_size - ask_size) / (bid_size + ask_size), in [-1, 1]
+        """
+        data = self.data[:, :levels]
+        ask = data[:, :, ASK_SIZE].sum(axis=1)
+        bid = data[:, :, BID_SIZE].sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (bid - ask) / (bid + ask)
+
+
+async def get_orderbook_matrix(tickers: str or list = "KRW-BTC",
+                               levels: int = None,
+                               contain_req: bool = False) -> tuple or OrderbookMatrix:
+    """Orderbook information request as OrderbookMatrix
+
+    Args:
+        tickers (str or list, optional): Coin's ticker. Defaults to "KRW-BTC".
+        levels (int, optional): Number of levels to keep. Defaults to None (all).
+        contain_req (bool, optional): Contain send request limitation information to return. Defaults to False.
+
+    Returns:
+        tuple or OrderbookMatrix: tuple if contain_req else OrderbookMatrix
+    """
+    body, remain = await get_orderbook(tickers, contain_req=True)
+    matrix = OrderbookMatrix.from_orderbook(body, levels)
+    return (matrix, remain) if contain_req else matrix
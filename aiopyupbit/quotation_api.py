@@ -1,36 +1,28 @@
 # !/usr/bin/python
 # -*- coding: utf-8 -*-
-import datetime
 import pandas as pd
 from pandas._libs.tslibs import Timestamp
 from pandas.core.frame import DataFrame
 if __name__ == "__main__":
+    from offload import CANDLE_ROW_BYTES, run_cpu
     from request_api import _call_public_api
+    from time_utils import KST, format_cursor, to_utc
 else:
+    from .offload import CANDLE_ROW_BYTES, run_cpu
     from .request_api import _call_public_api
+    from .time_utils import KST, format_cursor, to_utc
 
 
-def convert_time_format(to: None or str or Timestamp) -> datetime.datetime:
-    """Convert time to datetime format
+def convert_time_format(to: None or str or Timestamp) -> str:
+    """Convert time to candle request cursor format
 
     Args:
-        to (None or str or Timestamp): Target time
+        to (None or str or Timestamp): Target time. Naive time is regarded as KST
 
     Returns:
-        datetime.datetime: Converted time
+        str: Converted time (UTC)
     """
-    if not to:
-        to = datetime.datetime.now()
-    elif isinstance(to, str):
-        to = pd.to_datetime(to).to_pydatetime()
-    elif isinstance(to, pd._libs.tslibs.timestamps.Timestamp):
-        to = to.to_pydatetime()
-
-    if not to.tzinfo:
-        to = to.astimezone()
-    else:
-        to = to.astimezone(datetime.timezone.utc)
-    return to.strftime("%Y-%m-%d %H:%M:%S")
+    return format_cursor(to_utc(to, tz=KST))
 
 
 async def get_tickers(fiat: str = "ALL",
@@ -48,6 +40,7 @@ async def get_tickers(fiat: str = "ALL",
     """
     url = "https://api.upbit.com/v1/market/all"
     body, remain = await _call_public_api(url)
+    tickers = body
     if fiat != 'ALL':
         tickers = [x for x in body if x['market'].startswith(fiat)]
     if not contain_name:
@@ -89,6 +82,33 @@ async def get_url_ohlcv(interval: str) -> str:
         return "https://api.upbit.com/v1/candles/days"
 
 
+def _ohlcv_frame(body: list) -> DataFrame:
+    """Build candle DataFrame from the candle API response
+
+    Args:
+        body (list): Candle API response
+
+    Returns:
+        DataFrame: Candle data
+    """
+    df = pd.DataFrame(body,
+                      columns=['candle_date_time_kst',
+                               'opening_price',
+                               'high_price',
+                               'low_price',
+                               'trade_price',
+                               'candle_acc_trade_volume',
+                               'candle_acc_trade_price'])
+    df = df.rename(columns={"candle_date_time_kst": "time",
+                            "opening_price": "open",
+                            "high_price": "high",
+                            "low_price": "low",
+                            "trade_price": "close",
+                            "candle_acc_trade_volume": "volume",
+                            "candle_acc_trade_price": "value"})
+    return df.sort_index(ascending=False)
+
+
 async def get_ohlcv(ticker: str = "KRW-BTC",
                     interval: str = "day",
                     count: int = 200,
@@ -112,25 +132,27 @@ async def get_ohlcv(ticker: str = "KRW-BTC",
                                           market=ticker,
                                           count=count,
                                           to=time)
-    df = pd.DataFrame(body,
-                      columns=['candle_date_time_kst',
-                               'opening_price',
-                               'high_price',
-                               'low_price',
-                               'trade_price',
-                               'candle_acc_trade_volume',
-                               'candle_acc_trade_price'])
-    df = df.rename(columns={"candle_date_time_kst": "time",
-                            "opening_price": "open",
-                            "high_price": "high",
-                            "low_price": "low",
-                            "trade_price": "close",
-                            "candle_acc_trade_volume": "volume",
-                            "candle_acc_trade_price": "value"})
-    df = df.sort_index(ascending=False)
+    df = await run_cpu(_ohlcv_frame, body, size=len(body) * CANDLE_ROW_BYTES)
     return (df, remain) if contain_req else df
 
 
+def _resample_daily(df: DataFrame, base: int) -> DataFrame:
+    """Resample hourly candle data to daily candle data
+
+    Args:
+        df (DataFrame): Hourly candle data
+        base (int): Resampling start index
+
+    Returns:
+        DataFrame: Daily candle data
+    """
+    return df.resample('24H', base=base).agg({'open': 'first',
+                                              'high': 'max',
+                                              'low': 'min',
+                                              'close': 'last',
+                                              'volume': 'sum'})
+
+
 async def get_daily_ohlcv_from_base(ticker: str = "KRW-BTC",
                                     base: int = 0,
                                     contain_req: bool = False) -> tuple or DataFrame:
@@ -152,11 +174,7 @@ async def get_daily_ohlcv_from_base(ticker: str = "KRW-BTC",
         df = await get_ohlcv(ticker,
                              interval="minute60",
                              contain_req=contain_req)
-    df = df.resample('24H', base=base).agg({'open': 'first',
-                                            'high': 'max',
-                                            'low': 'min',
-                                            'close': 'last',
-                                            'volume': 'sum'})
+    df = await run_cpu(_resample_daily, df, base, size=len(df) * CANDLE_ROW_BYTES)
     return (df, remain) if contain_req else df
 
 
@@ -174,7 +192,8 @@ async def get_current_price(ticker: str = "KRW-BTC",
         float or dict or tuple: tuple if contain_req else float or dict
     """
     url = "https://api.upbit.com/v1/ticker"
-    body, remain = await _call_public_api(url, markets=ticker)
+    markets = ticker if isinstance(ticker, str) else ",".join(ticker)
+    body, remain = await _call_public_api(url, markets=markets)
     if isinstance(ticker, str) or (isinstance(ticker, list) and len(ticker) == 1):
         ret = body[0] if contain_etc else body[0]['trade_price']
     else:
@@ -195,5 +214,6 @@ async def get_orderbook(tickers: str = "KRW-BTC",
         tuple or list: tuple if contain_req else list
     """
     url = "https://api.upbit.com/v1/orderbook"
-    body, remain = await _call_public_api(url, markets=tickers)
+    markets = tickers if isinstance(tickers, str) else ",".join(tickers)
+    body, remain = await _call_public_api(url, markets=markets)
     return (body, remain) if contain_req else body
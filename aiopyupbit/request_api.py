@@ -1,11 +1,19 @@
 # !/usr/bin/python
 # -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
 import re
+import weakref
 import aiohttp
 if __name__ == "__main__":
     from errors import (raise_error, RemainingReqParsingError)
+    from offload import run_cpu
 else:
     from .errors import (raise_error, RemainingReqParsingError)
+    from .offload import run_cpu
 
 
 async def is_request_success(code: int):
@@ -32,53 +40,230 @@ async def _parse_remaining_req(remaining_req: str):
         raise RemainingReqParsingError()
 
 
-async def _call_public_api(url: str, **kwargs):
+QUOTATION = "quotation"
+EXCHANGE = "exchange"
+
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_PRIVATE = 2
+PRIORITY_QUOTATION = 3
+
+
+class _Lane:
+    """Keep-alive connection pool with prioritized admission
+
+    At most `limit` requests of a lane are in flight at once. Waiting requests
+    are admitted by priority (lower first), then in arrival order. A lane is
+    only used from the event loop of its Transport.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._session = None
+        self._active = 0
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit,
+                                             keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def acquire(self, priority: int):
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot over without decrementing the active count
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    async def request(self, method: str, url: str, priority: int, **kwargs):
+        await self.acquire(priority)
+        try:
+            async with self.session().request(method, url, **kwargs) as response:
+                if await is_request_success(response.status):
+                    remain = await _parse_remaining_req(response.headers.get('Remaining-Req'))
+                    raw = await response.read()
+                    body = await run_cpu(json.loads, raw, size=len(raw))
+                    return body, remain
+                else:
+                    await raise_error(response)
+        finally:
+            self.release()
+
+    async def warm_up(self, connections: int):
+        session = self.session()
+
+        async def _touch():
+            try:
+                async with session.head("https://api.upbit.com") as response:
+                    await response.read()
+            except aiohttp.ClientError:
+                pass
+
+        await asyncio.gather(*[_touch() for _ in range(min(connections, self.limit))])
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class Transport:
+    """Connection pools (QUOTATION and EXCHANGE lanes) of one event loop
+
+    Every event loop gets its own default Transport, which `close_sessions()`
+    closes. A Transport can also be owned explicitly; requests made inside
+    `async with Transport():` use it, and its sessions are closed on exit:
+
+        async with aiopyupbit.Transport():
+            await aiopyupbit.get_current_price("KRW-BTC")
+    """
+
+    def __init__(self, quotation_limit: int = 20, exchange_limit: int = 10):
+        """
+        Args:
+            quotation_limit (int, optional): Concurrent quotation requests. Defaults to 20.
+            exchange_limit (int, optional): Concurrent private and order requests. Defaults to 10.
+        """
+        self.lanes = {QUOTATION: _Lane(QUOTATION, quotation_limit),
+                      EXCHANGE: _Lane(EXCHANGE, exchange_limit)}
+        self._loop = None
+        self._tokens = []
+        self._scope = None
+
+    def lane(self, name: str) -> _Lane:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            # Weak, so the per-loop default Transport does not keep its loop alive
+            self._loop = weakref.ref(loop)
+        elif self._loop() is not loop:
+            # Sessions and futures cannot be shared between event loops
+            raise RuntimeError("Transport is bound to another event loop")
+        return self.lanes[name]
+
+    async def close(self):
+        """Close all pooled connections"""
+        for lane in self.lanes.values():
+            await lane.close()
+
+    async def __aenter__(self):
+        self._tokens.append(_current_transport.set(self))
+        return self
+
+    async def __aexit__(self, *exc):
+        _current_transport.reset(self._tokens.pop())
+        await self.close()
+
+
+_current_transport = contextvars.ContextVar("aiopyupbit_transport", default=None)
+_loop_transports = weakref.WeakKeyDictionary()
+
+
+async def _loop_scope(transport: Transport):
+    # The event loop finalizes pending async generators when it shuts down
+    # (asyncio.run), which closes the default Transport of that loop
+    try:
+        yield
+    finally:
+        loop = asyncio.get_running_loop()
+        if _loop_transports.get(loop) is transport:
+            del _loop_transports[loop]
+        await transport.close()
+
+
+async def _get_transport() -> Transport:
+    transport = _current_transport.get()
+    if transport is None:
+        loop = asyncio.get_running_loop()
+        transport = _loop_transports.get(loop)
+        if transport is None:
+            transport = _loop_transports[loop] = Transport()
+            transport._scope = _loop_scope(transport)
+            await transport._scope.__anext__()
+    return transport
+
+
+async def warm_up(lane: str = EXCHANGE, connections: int = 2):
+    """Open keep-alive connections ahead of a burst of requests
+
+    Args:
+        lane (str, optional): Connection pool (EXCHANGE, QUOTATION). Defaults to EXCHANGE.
+        connections (int, optional): Number of connections to open. Defaults to 2.
+    """
+    transport = await _get_transport()
+    await transport.lane(lane).warm_up(connections)
+
+
+async def keep_warm(lane: str = EXCHANGE, connections: int = 2, interval: float = 30):
+    """Keep connections of the pool open until cancelled
+
+    Args:
+        lane (str, optional): Connection pool (EXCHANGE, QUOTATION). Defaults to EXCHANGE.
+        connections (int, optional): Number of connections to keep. Defaults to 2.
+        interval (float, optional): Seconds between keep-alive requests. Defaults to 30.
+    """
+    while True:
+        await warm_up(lane, connections)
+        await asyncio.sleep(interval)
+
+
+async def close_sessions():
+    """Close the pooled connections of the current Transport
+
+    Call it before the event loop ends, e.g. at the end of the coroutine passed to asyncio.run.
+    """
+    transport = _current_transport.get()
+    if transport is not None:
+        await transport.close()
+        return
+    transport = _loop_transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport._scope.aclose()
+
+
+async def _request(lane: str, method: str, url: str, priority: int, **kwargs):
+    transport = await _get_transport()
+    return await transport.lane(lane).request(method, url, priority, **kwargs)
+
+
+async def _call_public_api(url: str, priority: int = PRIORITY_QUOTATION, **kwargs):
     """Call get type api
 
     Args:
         url (str): REST API url
+        priority (int, optional): Request priority, lower is served first. Defaults to PRIORITY_QUOTATION.
 
     Returns:
         tuple: (data, req_limit_info) 
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=kwargs) as response:
-            if await is_request_success(response.status):
-                remain = await _parse_remaining_req(response.headers.get('Remaining-Req'))
-                body = await response.json()
-                return body, remain
-            else:
-                await raise_error(response)
-
-
-async def _send_post_request(url, headers=None, data=None):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, headers=headers, data=data) as response:
-            if await is_request_success(response.status):
-                remain = await _parse_remaining_req(response.headers.get('Remaining-Req'))
-                body = await response.json()
-                return body, remain
-            else:
-                await raise_error(response)
-
-
-async def _send_get_request(url, headers=None, data=None):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, data=data) as response:
-            if await is_request_success(response.status):
-                remain = await _parse_remaining_req(response.headers.get('Remaining-Req'))
-                body = await response.json()
-                return body, remain
-            else:
-                await raise_error(response)
-
-
-async def _send_delete_request(url, headers=None, data=None):
-    async with aiohttp.ClientSession() as session:
-        async with session.delete(url, headers=headers, data=data) as response:
-            if await is_request_success(response.status):
-                remain = await _parse_remaining_req(response.headers.get('Remaining-Req'))
-                body = await response.json()
-                return body, remain
-            else:
-                await raise_error(response)
+    return await _request(QUOTATION, "GET", url, priority, params=kwargs)
+
+
+async def _send_post_request(url, headers=None, data=None, priority=PRIORITY_ORDER):
+    return await _request(EXCHANGE, "POST", url, priority, headers=headers, data=data)
+
+
+async def _send_get_request(url, headers=None, data=None, priority=PRIORITY_PRIVATE):
+    return await _request(EXCHANGE, "GET", url, priority, headers=headers, data=data)
+
+
+async def _send_delete_request(url, headers=None, data=None, priority=PRIORITY_CANCEL):
+    return await _request(EXCHANGE, "DELETE", url, priority, headers=headers, data=data)
@@ -0,0 +1,434 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import datetime
+import heapq
+import re
+import uuid as _uuid
+from pandas.core.frame import DataFrame
+if __name__ == "__main__":
+    from errors import (CreateAskError, CreateBidError, InsufficientFundsAsk, InsufficientFundsBid,
+                        OrderNotFound, OutOfScope, UnderMinTotalAsk, UnderMinTotalBid, ValidationError)
+    from exchange_api import DEFAULT_FEES, MIN_ORDER_TOTALS, Upbit, get_tick_size
+    from time_utils import KST, UTC, to_utc
+else:
+    from .errors import (CreateAskError, CreateBidError, InsufficientFundsAsk, InsufficientFundsBid,
+                         OrderNotFound, OutOfScope, UnderMinTotalAsk, UnderMinTotalBid, ValidationError)
+    from .exchange_api import DEFAULT_FEES, MIN_ORDER_TOTALS, Upbit, get_tick_size
+    from .time_utils import KST, UTC, to_utc
+
+_UUID_PATTERN = re.compile(r"^\w+-\w+-\w+-\w+-\w+$")
+
+
+class SimulatedUpbit(Upbit):
+    """Offline exchange with the same async method surface as `Upbit`
+
+    Market data is replayed from candles (`load_candles`) or trade ticks (`load_trades`)
+    in virtual time with `advance`. Orders are matched against the bars following the
+    one they were placed on:
+
+    * market orders fill at the next bar's opening price
+    * limit bids fill once the bar's low reaches the limit price, at the lower of
+      the limit price and the bar's opening price
+    * limit asks fill once the bar's high reaches the limit price, at the higher of
+      the limit price and the bar's opening price
+
+    Orders always fill completely; traded volume is not taken into account.
+    """
+
+    def __init__(self,
+                 balances: dict = None,
+                 fees: dict = None,
+                 min_totals: dict = None):
+        """
+        Args:
+            balances (dict, optional): Initial balances ({"KRW": 1000000}). Defaults to None.
+            fees (dict, optional): Fee rate for each quote currency. Defaults to DEFAULT_FEES.
+            min_totals (dict, optional): Minimum order total for each quote currency. Defaults to MIN_ORDER_TOTALS.
+        """
+        super().__init__(access=None, secret=None)
+        self.fees = dict(DEFAULT_FEES, **(fees or {}))
+        self.min_totals = dict(MIN_ORDER_TOTALS, **(min_totals or {}))
+        # currency -> [balance, locked, avg_buy_price]
+        self._accounts = {"KRW": [0.0, 0.0, 0.0]}
+        for currency, balance in (balances or {}).items():
+            self._accounts[currency] = [float(balance), 0.0, 0.0]
+        self._feeds = []
+        self._events = None
+        self._pending = None
+        self._last = {}
+        self._orders = {}
+        self._open = {}
+        self.now = None
+
+    # --------------------------------------------------------------------------------
+    # Market data replay
+    # --------------------------------------------------------------------------------
+    def load_candles(self, ticker: str, df: DataFrame):
+        """Load candle data to replay
+
+        Args:
+            ticker (str): Coin's ticker
+            df (DataFrame): Candle data in the `get_ohlcv` format. Naive times are regarded as KST
+        """
+        times = df["time"] if "time" in df.columns else df.index
+        columns = (times, df["open"], df["high"], df["low"], df["close"], df["volume"])
+        bars = [(_to_timestamp(t), ticker, float(o), float(h), float(l), float(c), float(v))
+                for t, o, h, l, c, v in zip(*columns)]
+        bars.sort(key=lambda x: x[0])
+        self._add_feed(ticker, bars)
+
+    def load_trades(self, ticker: str, trades: list):
+        """Load trade ticks to replay
+
+        Args:
+            ticker (str): Coin's ticker
+            trades (list): Trade ticks ({"timestamp": ms, "trade_price": float, "trade_volume": float})
+        """
+        bars = []
+        for x in trades:
+            price = float(x["trade_price"])
+            bars.append((int(x["timestamp"]), ticker, price, price, price, price, float(x["trade_volume"])))
+        bars.sort(key=lambda x: x[0])
+        self._add_feed(ticker, bars)
+
+    def _add_feed(self, ticker: str, bars: list):
+        if self._events is not None:
+            raise RuntimeError("Market data must be loaded before the replay starts")
+        self._feeds.append(bars)
+        self._open.setdefault(ticker, [])
+
+    def advance(self) -> bool:
+        """Move virtual time to the next timestamp and match open orders
+
+        Returns:
+            bool: False if there is no more market data
+        """
+        if self._events is None:
+            self._events = heapq.merge(*self._feeds, key=lambda x: x[0])
+            self._pending = next(self._events, None)
+        bar = self._pending
+        if bar is None:
+            return False
+
+        ts = bar[0]
+        self.now = datetime.datetime.fromtimestamp(ts / 1000, UTC)
+        while bar is not None and bar[0] == ts:
+            ticker = bar[1]
+            if self._open[ticker]:
+                self._match(ticker, bar)
+            self._last[ticker] = bar
+            bar = next(self._events, None)
+        self._pending = bar
+        return True
+
+    async def run(self, strategy):
+        """Replay all market data, calling the strategy on every timestamp
+
+        Args:
+            strategy (coroutine function): Called with this exchange after every step
+        """
+        while self.advance():
+            await strategy(self)
+
+    async def get_current_price(self, ticker: str = "KRW-BTC") -> float:
+        """Last price of the replayed market data
+
+        Args:
+            ticker (str, optional): Coin's ticker. Defaults to "KRW-BTC".
+
+        Returns:
+            float: Last price
+        """
+        bar = self._last.get(ticker)
+        return bar[5] if bar else None
+
+    # --------------------------------------------------------------------------------
+    # Matching engine
+    # --------------------------------------------------------------------------------
+    def _match(self, ticker: str, bar: tuple):
+        _, _, o, h, l, _, _ = bar
+        remain = []
+        for order in self._open[ticker]:
+            ord_type = order["ord_type"]
+            if ord_type in ("price", "market"):
+                price = o
+            elif order["side"] == "bid" and l <= order["_price"]:
+                # A bar opening through the limit fills at the better opening price
+                price = min(order["_price"], o)
+            elif order["side"] == "ask" and h >= order["_price"]:
+                price = max(order["_price"], o)
+            else:
+                remain.append(order)
+                continue
+            self._fill(order, price)
+        self._open[ticker] = remain
+
+    def _fill(self, order: dict, price: float):
+        quote, base = order["market"].split("-")
+        fee_rate = self.fees.get(quote, 0)
+        quote_account = self._account(quote)
+        base_account = self._account(base)
+
+        if order["side"] == "bid":
+            if order["ord_type"] == "price":
+                funds = order["_price"]
+                volume = funds / price
+            else:
+                volume = order["_volume"]
+                funds = price * volume
+            fee = funds * fee_rate
+            quote_account[1] -= order["_locked"]
+            quote_account[0] += order["_locked"] - funds - fee
+            held = base_account[0] + base_account[1]
+            base_account[2] = (base_account[2] * held + funds) / (held + volume)
+            base_account[0] += volume
+        else:
+            volume = order["_volume"]
+            funds = price * volume
+            fee = funds * fee_rate
+            base_account[1] -= volume
+            quote_account[0] += funds - fee
+            if base_account[0] + base_account[1] <= 0:
+                # Upbit resets the average buying price once the position is closed
+                base_account[2] = 0.0
+
+        created_at = self._timestamp()
+        order["_trades"].append({"market": order["market"],
+                                 "uuid": str(_uuid.uuid4()),
+                                 "price": str(price),
+                                 "volume": str(volume),
+                                 "funds": str(funds),
+                                 "side": order["side"],
+                                 "created_at": created_at})
+        order.update({"state": "done",
+                      "remaining_volume": "0.0" if order["volume"] else None,
+                      "executed_volume": str(volume),
+                      "paid_fee": str(fee),
+                      "remaining_fee": "0.0",
+                      "locked": "0.0",
+                      "trades_count": 1,
+                      "_locked": 0.0})
+
+    # --------------------------------------------------------------------------------
+    # Accounts
+    # --------------------------------------------------------------------------------
+    def _account(self, currency: str) -> list:
+        return self._accounts.setdefault(currency, [0.0, 0.0, 0.0])
+
+    def _timestamp(self) -> str:
+        now = self.now or datetime.datetime.now(UTC)
+        return now.astimezone(KST).isoformat()
+
+    def _order_body(self, order: dict, trades: bool = False) -> dict:
+        body = {k: v for k, v in order.items() if not k.startswith("_")}
+        if trades:
+            body["trades"] = list(order["_trades"])
+        return body
+
+    @staticmethod
+    def _remain() -> dict:
+        return {"group": "simulator", "min": 1800, "sec": 30}
+
+    async def _request_headers(self, query: dict or list = None) -> dict:
+        return {"Authorization": "Bearer simulator"}
+
+    async def check_authentication(self) -> tuple or bool:
+        return (True, None)
+
+    async def get_balances(self, contain_req: bool = False) -> tuple or list:
+        body = [{"currency": currency,
+                 "balance": str(balance),
+                 "locked": str(locked),
+                 "avg_buy_price": str(avg_buy_price),
+                 "avg_buy_price_modified": False,
+                 "unit_currency": "KRW"}
+                for currency, (balance, locked, avg_buy_price) in self._accounts.items()
+                if currency == "KRW" or balance > 0 or locked > 0]
+        return (body, self._remain()) if contain_req else body
+
+    async def get_chance(self, ticker: str, contain_req: bool = False) -> tuple or dict:
+        if ticker not in self._open:
+            raise ValidationError()
+        quote, base = ticker.split("-")
+        fee = str(self.fees.get(quote, 0))
+
+        def account(currency):
+            balance, locked, avg_buy_price = self._account(currency)
+            return {"currency": currency,
+                    "balance": str(balance),
+                    "locked": str(locked),
+                    "avg_buy_price": str(avg_buy_price),
+                    "avg_buy_price_modified": False,
+                    "unit_currency": "KRW"}
+
+        body = {"bid_fee": fee,
+                "ask_fee": fee,
+                "market": {"id": ticker,
+                           "name": f"{base}/{quote}",
+                           "order_types": ["limit"],
+                           "order_sides": ["ask", "bid"],
+                           "bid": {"currency": quote, "min_total": self.min_totals.get(quote, 0)},
+                           "ask": {"currency": base, "min_total": self.min_totals.get(quote, 0)},
+                           "state": "active"},
+                "bid_account": account(quote),
+                "ask_account": account(base)}
+        return (body, self._remain()) if contain_req else body
+
+    # --------------------------------------------------------------------------------
+    # Orders
+    # --------------------------------------------------------------------------------
+    def _place(self, ticker: str, side: str, ord_type: str, price: float, volume: float) -> dict:
+        if ticker not in self._open:
+            raise ValidationError()
+        quote, base = ticker.split("-")
+        fee_rate = self.fees.get(quote, 0)
+        min_total = self.min_totals.get(quote, 0)
+        bid = side == "bid"
+
+        if ord_type == "limit":
+            if quote == "KRW" and get_tick_size(price, method="round") != price:
+                raise CreateBidError() if bid else CreateAskError()
+            total = price * volume
+        elif ord_type == "price":
+            total = price
+        else:
+            last = self._last.get(ticker)
+            total = volume * last[5] if last else 0
+        if total < min_total:
+            raise UnderMinTotalBid() if bid else UnderMinTotalAsk()
+
+        if bid:
+            account = self._account(quote)
+            locked = total * (1 + fee_rate)
+            if account[0] < locked:
+                raise InsufficientFundsBid()
+            reserved_fee = total * fee_rate
+        else:
+            account = self._account(base)
+            locked = volume
+            if account[0] < locked:
+                raise InsufficientFundsAsk()
+            reserved_fee = total * fee_rate
+        account[0] -= locked
+        account[1] += locked
+
+        order = {"uuid": str(_uuid.uuid4()),
+                 "side": side,
+                 "ord_type": ord_type,
+                 "price": None if ord_type == "market" else str(price),
+                 "state": "wait",
+                 "market": ticker,
+                 "created_at": self._timestamp(),
+                 "volume": None if ord_type == "price" else str(volume),
+                 "remaining_volume": None if ord_type == "price" else str(volume),
+                 "reserved_fee": str(reserved_fee),
+                 "remaining_fee": str(reserved_fee),
+                 "paid_fee": "0.0",
+                 "locked": str(locked),
+                 "executed_volume": "0.0",
+                 "trades_count": 0,
+                 "_price": price,
+                 "_volume": volume,
+                 "_locked": locked,
+                 "_trades": []}
+        self._orders[order["uuid"]] = order
+        self._open[ticker].append(order)
+        return self._order_body(order)
+
+    async def get_order(self,
+                        ticker_or_uuid: str,
+                        state: str = 'wait',
+                        kind: str = 'normal',
+                        contain_req: bool = False,
+                        states: list = None,
+                        identifiers: list = None,
+                        page: int = 1,
+                        limit: int = 100,
+                        order_by: str = 'desc') -> tuple or list:
+        if ticker_or_uuid and len(_UUID_PATTERN.findall(ticker_or_uuid)) > 0:
+            orders = [self._orders[ticker_or_uuid]] if ticker_or_uuid in self._orders else []
+        else:
+            states = states or [state]
+            orders = [x for x in self._orders.values()
+                      if ticker_or_uuid in (None, x["market"]) and x["state"] in states]
+            if order_by == 'desc':
+                orders.reverse()
+            orders = orders[(page - 1) * limit:page * limit]
+        body = [self._order_body(x) for x in orders]
+        return (body, self._remain()) if contain_req else body
+
+    async def get_individual_order(self,
+                                   uuid: str,
+                                   contain_req: bool = False) -> tuple or dict:
+        if uuid not in self._orders:
+            raise OrderNotFound()
+        body = self._order_body(self._orders[uuid], trades=True)
+        return (body, self._remain()) if contain_req else body
+
+    async def cancel_order(self,
+                           uuid: str,
+                           contain_req: bool = False) -> tuple or dict:
+        if uuid not in self._orders:
+            raise OrderNotFound()
+        order = self._orders[uuid]
+        if order["state"] != "wait":
+            raise ValidationError()
+        quote, base = order["market"].split("-")
+        account = self._account(quote if order["side"] == "bid" else base)
+        account[0] += order["_locked"]
+        account[1] -= order["_locked"]
+        self._open[order["market"]].remove(order)
+        order.update({"state": "cancel", "locked": "0.0", "_locked": 0.0})
+        body = self._order_body(order)
+        return (body, self._remain()) if contain_req else body
+
+    async def buy_limit_order(self,
+                              ticker: str,
+                              price: float,
+                              volume: float,
+                              contain_req: bool = False) -> tuple or dict:
+        body = self._place(ticker, "bid", "limit", price, volume)
+        return (body, self._remain()) if contain_req else body
+
+    async def buy_market_order(self,
+                               ticker: str,
+                               price: float,
+                               contain_req: bool = False) -> tuple or dict:
+        body = self._place(ticker, "bid", "price", price, None)
+        return (body, self._remain()) if contain_req else body
+
+    async def sell_limit_order(self,
+                               ticker: str,
+                               price: float,
+                               volume: float,
+                               contain_req: bool = False) -> tuple or dict:
+        body = self._place(ticker, "ask", "limit", price, volume)
+        return (body, self._remain()) if contain_req else body
+
+    async def sell_market_order(self,
+                                ticker: str,
+                                volume: float,
+                                contain_req: bool = False) -> tuple or dict:
+        body = self._place(ticker, "ask", "market", None, volume)
+        return (body, self._remain()) if contain_req else body
+
+    async def get_individual_withdraw_order(self, *args, **kwargs):
+        raise OutOfScope()
+
+    async def withdraw_coin(self, *args, **kwargs):
+        raise OutOfScope()
+
+    async def withdraw_cash(self, *args, **kwargs):
+        raise OutOfScope()
+
+    async def get_deposit_withdraw_status(self, *args, **kwargs):
+        raise OutOfScope()
+
+    async def get_api_key_list(self, *args, **kwargs):
+        raise OutOfScope()
+
+
+def _to_timestamp(t) -> int:
+    if isinstance(t, (int, float)):
+        return int(t)
+    return int(to_utc(t, tz=KST).timestamp() * 1000)
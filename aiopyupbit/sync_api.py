@@ -0,0 +1,138 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+if __name__ == "__main__":
+    import quotation_api
+    from exchange_api import Upbit
+    from orderbook import get_orderbook_matrix
+    from request_api import Transport, _current_transport
+else:
+    from . import quotation_api
+    from .exchange_api import Upbit
+    from .orderbook import get_orderbook_matrix
+    from .request_api import Transport, _current_transport
+
+_QUOTATION_FUNCTIONS = [quotation_api.get_tickers,
+                        quotation_api.get_url_ohlcv,
+                        quotation_api.get_ohlcv,
+                        quotation_api.get_daily_ohlcv_from_base,
+                        quotation_api.get_current_price,
+                        quotation_api.get_orderbook,
+                        get_orderbook_matrix]
+
+
+class SyncClient:
+    """Thread-safe synchronous facade
+
+    One event loop runs in a background thread for the lifetime of the client,
+    and every call is submitted to it with the client's own `Transport`. Threads
+    sharing a client therefore share one connection pool per lane and one
+    priority limiter, while separate clients are independent. Every quotation
+    function and every `Upbit` method is available with the same arguments:
+
+        with SyncClient(access, secret) as client:
+            client.get_current_price("KRW-BTC")
+            client.buy_limit_order("KRW-BTC", 50000000, 0.001)
+    """
+
+    def __init__(self,
+                 access: str = None,
+                 secret: str = None,
+                 upbit: Upbit = None,
+                 timeout: float = None):
+        """
+        Args:
+            access (str, optional): Access key. Defaults to None.
+            secret (str, optional): Secret key. Defaults to None.
+            upbit (Upbit, optional): Upbit instance to use instead of access/secret. Defaults to None.
+            timeout (float, optional): Default call timeout in seconds. Defaults to None.
+        """
+        self.upbit = upbit if upbit is not None else (Upbit(access, secret) if access else None)
+        self.timeout = timeout
+        self._transport = Transport()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="aiopyupbit", daemon=True)
+        self._thread.start()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _scoped(self, coro):
+        token = _current_transport.set(self._transport)
+        try:
+            return await coro
+        finally:
+            _current_transport.reset(token)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, coro, timeout: float = None):
+        """Run a coroutine on the background loop and wait for the result
+
+        The coroutine is cancelled on the loop when the timeout expires, so a
+        timed out order request is not sent later behind the caller's back.
+
+        Args:
+            coro (coroutine): Coroutine
+            timeout (float, optional): Timeout in seconds. Defaults to the client timeout.
+
+        Returns:
+            Any: Result of the coroutine
+        """
+        if self._closed:
+            coro.close()
+            raise RuntimeError("SyncClient is closed")
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("SyncClient cannot be called from its own event loop")
+        future = asyncio.run_coroutine_threadsafe(self._scoped(coro), self._loop)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def close(self):
+        """Close the client's pooled connections and stop the background loop"""
+        with self._lock:
+            if self._closed:
+                return
+            self.run(self._transport.close())
+            self._closed = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def _sync_function(func):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        return self.run(func(*args, **kwargs))
+    return wrapper
+
+
+def _sync_method(name):
+    @functools.wraps(getattr(Upbit, name))
+    def wrapper(self, *args, **kwargs):
+        if self.upbit is None:
+            raise RuntimeError("SyncClient was created without access/secret keys")
+        return self.run(getattr(self.upbit, name)(*args, **kwargs))
+    return wrapper
+
+
+for _func in _QUOTATION_FUNCTIONS:
+    setattr(SyncClient, _func.__name__, _sync_function(_func))
+for _name, _func in inspect.getmembers(Upbit, inspect.iscoroutinefunction):
+    if not _name.startswith("_"):
+        setattr(SyncClient, _name, _sync_method(_name))
@@ -0,0 +1,189 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import datetime
+from dateutil import parser as _dateutil_parser
+
+UTC = datetime.timezone.utc
+KST = datetime.timezone(datetime.timedelta(hours=9), "KST")
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=UTC)
+# 1970-01-05 is the first Monday after the epoch; weekly candles open on Monday 00:00 UTC
+_WEEK_ANCHOR = datetime.datetime(1970, 1, 5, tzinfo=UTC)
+
+# Fixed-width intervals in seconds. Minute and day candles are aligned to the UTC epoch
+# (day candles open at 09:00 KST == 00:00 UTC)
+_INTERVAL_SECONDS = {
+    "minute1": 60,
+    "minute3": 180,
+    "minute5": 300,
+    "minute10": 600,
+    "minute15": 900,
+    "minute30": 1800,
+    "minute60": 3600,
+    "minute240": 14400,
+    "day": 86400,
+    "week": 604800,
+}
+
+
+def normalize_interval(interval: str) -> str:
+    """Normalize candle interval name
+
+    Args:
+        interval (str): "day", "days", "minute1", "minutes1", ..., "week", "month"
+
+    Returns:
+        str: Normalized interval ("day", "minute1", ..., "week", "month"). Unknown values fall back to "day"
+    """
+    if interval in ("month", "months"):
+        return "month"
+    if interval.endswith("s") and interval[:-1] in _INTERVAL_SECONDS:
+        interval = interval[:-1]
+    elif interval.startswith("minutes"):
+        interval = "minute" + interval[len("minutes"):]
+    return interval if interval in _INTERVAL_SECONDS else "day"
+
+
+def to_utc(to: None or str or datetime.datetime = None,
+           tz: datetime.tzinfo = KST) -> datetime.datetime:
+    """Convert time to timezone aware UTC datetime
+
+    Args:
+        to (None or str or datetime.datetime, optional): Target time. pandas Timestamp is accepted as well. Defaults to None (now).
+        tz (datetime.tzinfo, optional): Timezone of naive input. Defaults to KST.
+
+    Returns:
+        datetime.datetime: UTC datetime
+    """
+    if not to:
+        return datetime.datetime.now(UTC)
+    if isinstance(to, str):
+        try:
+            to = datetime.datetime.fromisoformat(to[:-1] + "+00:00" if to.endswith("Z") else to)
+        except ValueError:
+            to = _dateutil_parser.parse(to)
+    elif not isinstance(to, datetime.datetime):
+        # datetime.date
+        to = datetime.datetime(to.year, to.month, to.day)
+
+    if to.tzinfo is None:
+        to = to.replace(tzinfo=tz)
+    return to.astimezone(UTC)
+
+
+def format_cursor(to: datetime.datetime) -> str:
+    """Format UTC datetime as candle request cursor
+
+    Args:
+        to (datetime.datetime): Timezone aware datetime
+
+    Returns:
+        str: "yyyy-MM-ddTHH:mm:ssZ"
+    """
+    if to.tzinfo is not UTC:
+        to = to.astimezone(UTC)
+    return f"{to.year:04d}-{to.month:02d}-{to.day:02d}T{to.hour:02d}:{to.minute:02d}:{to.second:02d}Z"
+
+
+def floor_time(to: datetime.datetime, interval: str = "day") -> datetime.datetime:
+    """Opening time of the candle which contains the time
+
+    Args:
+        to (datetime.datetime): Timezone aware datetime
+        interval (str, optional): Candle data interval. Defaults to "day".
+
+    Returns:
+        datetime.datetime: Candle opening time (UTC)
+    """
+    interval = normalize_interval(interval)
+    to = to.astimezone(UTC)
+    if interval == "month":
+        return datetime.datetime(to.year, to.month, 1, tzinfo=UTC)
+    step = _INTERVAL_SECONDS[interval]
+    anchor = _WEEK_ANCHOR if interval == "week" else _EPOCH
+    seconds = (to - anchor) // datetime.timedelta(seconds=1)
+    return anchor + datetime.timedelta(seconds=seconds - seconds % step)
+
+
+def shift_time(to: datetime.datetime, interval: str = "day", n: int = 1) -> datetime.datetime:
+    """Move candle opening time by n candles
+
+    Args:
+        to (datetime.datetime): Candle opening time (UTC)
+        interval (str, optional): Candle data interval. Defaults to "day".
+        n (int, optional): Number of candles, negative to move backward. Defaults to 1.
+
+    Returns:
+        datetime.datetime: Shifted candle opening time (UTC)
+    """
+    interval = normalize_interval(interval)
+    if interval == "month":
+        months = to.year * 12 + (to.month - 1) + n
+        return to.replace(year=months // 12, month=months % 12 + 1)
+    return to + datetime.timedelta(seconds=_INTERVAL_SECONDS[interval] * n)
+
+
+def candle_times(start: None or str or datetime.datetime,
+                 end: None or str or datetime.datetime = None,
+                 interval: str = "day",
+                 tz: datetime.tzinfo = KST) -> list:
+    """Candle opening time grid of the range [start, end)
+
+    Args:
+        start (None or str or datetime.datetime): Start time
+        end (None or str or datetime.datetime, optional): End time (exclusive). Defaults to None (now).
+        interval (str, optional): Candle data interval. Defaults to "day".
+        tz (datetime.tzinfo, optional): Timezone of naive input. Defaults to KST.
+
+    Returns:
+        list: Candle opening times (UTC), ascending
+    """
+    interval = normalize_interval(interval)
+    start, end = to_utc(start, tz), to_utc(end, tz)
+    t = floor_time(start, interval)
+    if t < start:
+        t = shift_time(t, interval)
+
+    if interval != "month":
+        step = datetime.timedelta(seconds=_INTERVAL_SECONDS[interval])
+        n = max(0, -((t - end) // step))
+        return [t + step * i for i in range(n)]
+
+    times = []
+    while t < end:
+        times.append(t)
+        t = shift_time(t, interval)
+    return times
+
+
+def plan_cursors(start: None or str or datetime.datetime,
+                 end: None or str or datetime.datetime = None,
+                 interval: str = "day",
+                 count: int = 200,
+                 tz: datetime.tzinfo = KST) -> list:
+    """Plan the candle requests needed to cover the range [start, end)
+
+    The candle API returns candles strictly before the `to` cursor, newest first,
+    so requests are planned from the end of the range backward.
+
+    Args:
+        start (None or str or datetime.datetime): Start time
+        end (None or str or datetime.datetime, optional): End time (exclusive). Defaults to None (now).
+        interval (str, optional): Candle data interval. Defaults to "day".
+        count (int, optional): Maximum candle count per request. Defaults to 200.
+        tz (datetime.tzinfo, optional): Timezone of naive input. Defaults to KST.
+
+    Returns:
+        list: [(to, count), ...] where `to` is a formatted cursor, newest request first
+    """
+    if count < 1:
+        raise ValueError(f"count must be at least 1: {count}")
+    times = candle_times(start, end, interval, tz)
+    plan = []
+    stop = len(times)
+    while stop > 0:
+        begin = max(0, stop - count)
+        cursor = times[stop] if stop < len(times) else shift_time(times[-1], interval)
+        plan.append((format_cursor(cursor), stop - begin))
+        stop = begin
+    return plan
@@ -0,0 +1,287 @@
+# !/usr/bin/python
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import uuid
+import aiohttp
+from aiohttp import web
+if __name__ == "__main__":
+    from errors import UpbitError
+    from order_history import iter_orders
+else:
+    from .errors import UpbitError
+    from .order_history import iter_orders
+
+PRIVATE_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1/private"
+
+_CLOSED_ORDER_STATES = ("done", "cancel", "prevented")
+
+
+class PrivateWebSocket:
+    """Authenticated WebSocket client for the myOrder and myAsset channels
+
+    Events are exposed as an async iterator and applied to a local state:
+
+    * `balances`: {currency: {'balance': float, 'locked': float}}
+    * `open_orders`: {uuid: latest order dict}
+
+    On every (re)connection the channels are subscribed first and then one REST
+    snapshot (balances and open orders) is taken. Events received meanwhile are
+    buffered by the socket and applied on top of the snapshot, so the local state
+    converges to the exchange state. myAsset events already received when the
+    snapshot returns carry balances the snapshot has replaced, so they are
+    dropped. A {'type': 'snapshot'} event is yielded after every re-sync.
+
+        async with PrivateWebSocket(upbit) as ws:
+            async for event in ws:
+                print(event['type'], ws.balances)
+    """
+
+    def __init__(self,
+                 upbit,
+                 codes: list = None,
+                 url: str = PRIVATE_WEBSOCKET_URL,
+                 reconnect_delay: float = 1,
+                 max_reconnect_delay: float = 30):
+        """
+        Args:
+            upbit (Upbit): Authenticated Upbit instance, used for the JWT and the REST snapshot
+            codes (list, optional): Market codes of myOrder. Defaults to None (all markets).
+            url (str, optional): WebSocket url. Defaults to PRIVATE_WEBSOCKET_URL.
+            reconnect_delay (float, optional): First reconnection delay in seconds. Defaults to 1.
+            max_reconnect_delay (float, optional): Maximum reconnection delay in seconds. Defaults to 30.
+        """
+        self.upbit = upbit
+        self.codes = codes
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.balances = {}
+        self.open_orders = {}
+        self._session = None
+        self._ws = None
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def __aiter__(self):
+        return self.events()
+
+    async def close(self):
+        """Close the connection and stop iteration"""
+        self._closed = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _connect(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        headers = await self.upbit._request_headers()
+        self._ws = await self._session.ws_connect(self.url, headers=headers, heartbeat=60)
+        my_order = {"type": "myOrder"}
+        if self.codes:
+            my_order["codes"] = list(self.codes)
+        await self._ws.send_str(json.dumps([{"ticket": str(uuid.uuid4())},
+                                            my_order,
+                                            {"type": "myAsset"},
+                                            {"format": "DEFAULT"}]))
+
+    async def _snapshot(self):
+        body = await self.upbit.get_balances()
+        self.balances = {x['currency']: {'balance': float(x['balance']),
+                                         'locked': float(x['locked'])} for x in body}
+        self.open_orders = {}
+        async for _, _, orders in iter_orders(self.upbit, self.codes or [None],
+                                             states=('wait', 'watch'), kind='all'):
+            self.open_orders.update((x['uuid'], x) for x in orders)
+
+    async def _read(self, queue: asyncio.Queue):
+        # Receive in the background so that the messages which arrived before the
+        # snapshot returned can be told apart. None marks the end of the connection
+        try:
+            async for msg in self._ws:
+                if msg.type not in (aiohttp.WSMsgType.BINARY, aiohttp.WSMsgType.TEXT):
+                    break
+                queue.put_nowait(msg)
+        finally:
+            queue.put_nowait(None)
+
+    def _apply(self, event: dict):
+        if event['type'] == 'myAsset':
+            for x in event['assets']:
+                self.balances[x['currency']] = {'balance': float(x['balance']),
+                                                'locked': float(x['locked'])}
+        elif event['type'] == 'myOrder':
+            if event['state'] in _CLOSED_ORDER_STATES:
+                self.open_orders.pop(event['uuid'], None)
+            else:
+                self.open_orders[event['uuid']] = event
+
+    async def events(self, types: tuple = None):
+        """Iterate over events, reconnecting until closed
+
+        Connection errors and REST snapshot errors are retried with exponential
+        backoff. The connection is closed when the iteration ends.
+
+        Args:
+            types (tuple, optional): Event types to yield (myOrder, myAsset, snapshot). Defaults to None (all).
+
+        Yields:
+            dict: Event
+        """
+        delay = self.reconnect_delay
+        try:
+            while not self._closed:
+                reader = None
+                try:
+                    await self._connect()
+                    queue = asyncio.Queue()
+                    reader = asyncio.ensure_future(self._read(queue))
+                    await self._snapshot()
+                    stale = queue.qsize()
+                    delay = self.reconnect_delay
+                    if types is None or 'snapshot' in types:
+                        yield {'type': 'snapshot'}
+                    while True:
+                        msg = await queue.get()
+                        if msg is None:
+                            # Raise the error which ended the connection, if any
+                            await reader
+                            break
+                        buffered, stale = stale > 0, stale - 1
+                        event = json.loads(msg.data)
+                        if 'type' not in event:
+                            # {"status": "UP"} etc.
+                            continue
+                        if buffered and event['type'] == 'myAsset':
+                            # Already replaced by the snapshot
+                            continue
+                        self._apply(event)
+                        if types is None or event['type'] in types:
+                            yield event
+                except (aiohttp.ClientError, asyncio.TimeoutError, UpbitError):
+                    pass
+                finally:
+                    if reader is not None:
+                        reader.cancel()
+                        await asyncio.gather(reader, return_exceptions=True)
+                    if self._ws is not None:
+                        await self._ws.close()
+                if not self._closed:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_reconnect_delay)
+        finally:
+            # The iteration ended (closed or an unexpected error): release the session
+            await self.close()
+
+
+class LocalPrivateServer:
+    """Local stand-in for the private WebSocket server, for tests
+
+        async with LocalPrivateServer() as server:
+            ws = PrivateWebSocket(upbit, url=server.url)
+            await server.push_asset([{'currency': 'KRW', 'balance': 1000, 'locked': 0}])
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            host (str, optional): Bind host. Defaults to "127.0.0.1".
+            port (int, optional): Bind port. Defaults to 0 (any free port).
+        """
+        self.host = host
+        self.port = port
+        self.url = None
+        self.clients = []
+        self.requests = []
+        self._runner = None
+        self._connected = asyncio.Event()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self) -> str:
+        """Start the server
+
+        Returns:
+            str: WebSocket url
+        """
+        app = web.Application()
+        app.router.add_get("/websocket/v1/private", self._handler)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self.url = f"ws://{self.host}:{self.port}/websocket/v1/private"
+        return self.url
+
+    async def stop(self):
+        """Stop the server"""
+        await self.drop()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handler(self, request):
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            raise web.HTTPUnauthorized()
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.requests.append({"headers": dict(request.headers),
+                              "subscription": json.loads(await ws.receive_str())})
+        self.clients.append(ws)
+        self._connected.set()
+        async for _ in ws:
+            pass
+        if ws in self.clients:
+            self.clients.remove(ws)
+        return ws
+
+    async def wait_connected(self):
+        """Wait until a client has subscribed"""
+        await self._connected.wait()
+        self._connected.clear()
+
+    async def push(self, event: dict):
+        """Send an event to every subscribed client
+
+        Args:
+            event (dict): Event
+        """
+        data = json.dumps(event).encode()
+        for ws in list(self.clients):
+            await ws.send_bytes(data)
+
+    async def push_order(self, **fields):
+        """Send a myOrder event
+
+        Args:
+            **fields: Event fields (uuid, code, state, ...)
+        """
+        await self.push(dict({"type": "myOrder"}, **fields))
+
+    async def push_asset(self, assets: list):
+        """Send a myAsset event
+
+        Args:
+            assets (list): [{'currency': 'KRW', 'balance': 1000, 'locked': 0}, ...]
+        """
+        await self.push({"type": "myAsset", "assets": assets})
+
+    async def drop(self):
+        """Close every client connection"""
+        for ws in list(self.clients):
+            await ws.close()
+        self.clients = []
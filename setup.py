@@ -4,6 +4,7 @@ import setuptools
 
 install_requires = [
     'pandas>=1.2.4',
+    'numpy>=1.20.0',
     'aiohttp>=3.7.4',
     'pyjwt>=2.1.0',
     'pytz>=2020.5',